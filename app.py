@@ -1,17 +1,22 @@
 from __future__ import annotations
 import argparse
-import json
 import os
 import sys
+import threading
 import uuid
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
+import orjson
+from cachetools import Cache, LRUCache
 sys.path.insert(0, str(Path(__file__).parent))
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, jsonify, request, send_file, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from src.components.conversation_manager.conversation_manager import ConversationManager
 from src.components.conversation_manager.llm_provider import create_provider
+from src.components.conversation_manager.session_logger import flush_log, read_log_entries
 from src.components.conversation_state import ConversationState
 from src.components.gap_detector import GapDetector, create_gap_detector
 from src.components.system_prompt.prompt_architect import MIN_NFR_PER_CATEGORY
@@ -28,10 +33,91 @@ PROJECTS_DIR = BASE_DIR / "projects"
 for d in (LOG_DIR, OUTPUT_DIR, PROJECTS_DIR):
     d.mkdir(parents=True, exist_ok=True)
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (jsonify and request.get_json)."""
+
+    def _options(self, sort_keys: bool) -> int:
+        # Keep Flask's default sorted-key output unless the app turns sort_keys off
+        return orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = self._options(kwargs.get("sort_keys", self.sort_keys))
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options(self.sort_keys))
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
 app = Flask(__name__, static_folder=str(BASE_DIR / "static"))
+app.json = OrjsonProvider(app)
 CORS(app)
 
-_sessions: dict[str, dict] = {}
+
+class _SessionCache(LRUCache):
+    """
+    Live sessions, bounded to SESSION_CACHE_MAX entries (least recently used
+    evicted first) so idle sessions don't keep RAM forever. Only the transcript
+    survives eviction: the session log stays on disk for the replay and download
+    endpoints, but the ConversationState (extracted requirements, domain gate,
+    SRS sections, srs_path) is gone, so the session can't take further turns.
+    Request threads share it, so every access takes the lock. Read-only
+    views (log listing, replay) use peek() so they don't count as a use.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize=maxsize)
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        with self._lock:
+            super().__delitem__(key)
+
+    def __contains__(self, key):
+        with self._lock:
+            return super().__contains__(key)
+
+    def __len__(self):
+        with self._lock:
+            return super().__len__()
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(super().__iter__()))
+
+    def get(self, key, default=None):
+        with self._lock:
+            return super().get(key, default)
+
+    def peek(self, key, default=None):
+        """Like get(), but leaves the entry's recency unchanged."""
+        with self._lock:
+            if key in self:
+                # LRUCache.__getitem__ marks the key as used; the base one doesn't
+                return Cache.__getitem__(self, key)
+            return default
+
+    def popitem(self):
+        with self._lock:
+            return super().popitem()
+
+
+# cachetools rejects every insert into a zero-size cache, so keep at least one
+_sessions: _SessionCache = _SessionCache(
+    maxsize=max(1, int(os.getenv("SESSION_CACHE_MAX", "1024"))))
 
 _provider_name: str = "stub"
 _provider_kwargs: dict = {}
@@ -48,6 +134,14 @@ def _get_session(session_id: str) -> Optional[dict]:
 def _require_session(session_id: str):
     s = _get_session(session_id)
     if s is None:
+        # A session with a log on disk existed but was evicted from _sessions
+        safe_sid = "".join(c for c in session_id if c.isalnum() or c == "-")[:40]
+        log_path = LOG_DIR / f"session_{safe_sid}.json"
+        flush_log(log_path)  # its first entries may still be queued
+        if safe_sid and log_path.exists():
+            return None, (jsonify({"error": f"Session '{session_id}' has expired; "
+                                            "its log is still available for replay",
+                                   "expired": True}), 410)
         return None, (jsonify({"error": f"Session '{session_id}' not found"}), 404)
     return s, None
 
@@ -70,21 +164,21 @@ def _load_project(project_id: str) -> Optional[dict]:
     if not p.exists():
         return None
     try:
-        return json.loads(p.read_text(encoding="utf-8"))
+        return orjson.loads(p.read_bytes())
     except Exception:
         return None
 
 
 def _save_project(project: dict):
     p = _project_path(project["id"])
-    p.write_text(json.dumps(project, indent=2, ensure_ascii=False), encoding="utf-8")
+    p.write_bytes(orjson.dumps(project, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
 
 def _list_projects() -> list[dict]:
     projects = []
     for f in sorted(PROJECTS_DIR.glob("*.json"), key=lambda x: -x.stat().st_mtime):
         try:
-            data = json.loads(f.read_text(encoding="utf-8"))
+            data = orjson.loads(f.read_bytes())
             projects.append(data)
         except Exception:
             pass
@@ -164,7 +258,7 @@ def create_project():
     if task_type not in ("elicitation", "srs_only"):
         return jsonify({"error": "task_type must be 'elicitation' or 'srs_only'"}), 400
 
-    project_id = str(uuid.uuid4())[:12]
+    project_id = uuid.uuid4().hex[:12]
     now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
     project = {
         "id": project_id,
@@ -369,41 +463,39 @@ def upload_requirements():
     })
 
 
-@app.route("/api/session/turn", methods=["POST"])
-def send_turn():
-    body = request.get_json(silent=True) or {}
+def _check_turn_request(body: dict):
+    """Validate a turn request; returns (session, user_message, error_response)."""
     session_id   = body.get("session_id", "")
     user_message = body.get("message", "").strip()
 
     if not user_message:
-        return jsonify({"error": "message is required"}), 400
+        return None, "", (jsonify({"error": "message is required"}), 400)
 
     session, err = _require_session(session_id)
     if err:
-        return err
+        return None, "", err
+
+    if session["state"].session_complete:
+        return None, "", (jsonify({"error": "Session complete. Generate SRS or start a new session."}), 400)
+    return session, user_message, None
 
+
+def _turn_payload(session_id: str, session: dict, result) -> dict:
+    """Build the /api/session/turn response body from a send_turn() result."""
     state: ConversationState     = session["state"]
     manager: ConversationManager = session["manager"]
-    logger                       = session["logger"]
     gap_detector: GapDetector    = session["gap_detector"]
 
-    if state.session_complete:
-        return jsonify({"error": "Session complete. Generate SRS or start a new session."}), 400
-
-    try:
-        result = manager.send_turn(user_message, state, logger)
-        # send_turn now returns SendTurnResult; unwrap for backwards compat
-        if hasattr(result, "primary_response"):
-            assistant_reply      = result.primary_response
-            follow_up_message   = result.follow_up_message
-            phase_transitioned   = result.phase_transitioned
-        else:
-            # Fallback: old code path returned a plain string
-            assistant_reply    = result
-            follow_up_message  = ""
-            phase_transitioned = False
-    except RuntimeError as e:
-        return jsonify({"error": str(e)}), 500
+    # send_turn now returns SendTurnResult; unwrap for backwards compat
+    if hasattr(result, "primary_response"):
+        assistant_reply      = result.primary_response
+        follow_up_message   = result.follow_up_message
+        phase_transitioned   = result.phase_transitioned
+    else:
+        # Fallback: old code path returned a plain string
+        assistant_reply    = result
+        follow_up_message  = ""
+        phase_transitioned = False
 
     post_gap_report, coverage_report = _build_coverage_payload(state, gap_detector)
     srs_ready = _is_srs_ready(state)
@@ -420,7 +512,7 @@ def send_turn():
             p["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
             _save_project(p)
 
-    return jsonify({
+    return {
         "session_id":         session_id,
         "assistant_reply":    assistant_reply,
         "follow_up_message":  follow_up_message,
@@ -433,7 +525,68 @@ def send_turn():
         "task_type":          session.get("task_type", "elicitation"),
         "scope_complete":     getattr(state, "scope_complete", False),
         "project_brief":      getattr(state, "project_brief", {}),
-    })
+    }
+
+
+def _sse(data: dict, event: str = "") -> str:
+    """Format one Server-Sent Events frame."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {app.json.dumps(data)}\n\n"
+
+
+@app.route("/api/session/turn", methods=["POST"])
+def send_turn():
+    body = request.get_json(silent=True) or {}
+    session, user_message, err = _check_turn_request(body)
+    if err:
+        return err
+
+    manager: ConversationManager = session["manager"]
+    try:
+        result = manager.send_turn(user_message, session["state"], session["logger"])
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify(_turn_payload(body.get("session_id", ""), session, result))
+
+
+@app.route("/api/session/turn/stream", methods=["POST"])
+def send_turn_stream():
+    """
+    Same as /api/session/turn, but streams the reply as Server-Sent Events.
+
+    Emits one `data: {"delta": "..."}` frame per generated text chunk, then a
+    final `event: done` frame carrying the full /api/session/turn payload
+    (coverage, gaps, phase) once post-turn processing has finished. Failures
+    after the stream has started are reported as an `event: error` frame.
+    """
+    body = request.get_json(silent=True) or {}
+    session, user_message, err = _check_turn_request(body)
+    if err:
+        return err
+
+    session_id = body.get("session_id", "")
+    manager: ConversationManager = session["manager"]
+
+    def _events():
+        stream = manager.send_turn_stream(user_message, session["state"], session["logger"])
+        try:
+            while True:
+                try:
+                    delta = next(stream)
+                except StopIteration as stop:
+                    result = stop.value
+                    break
+                yield _sse({"delta": delta})
+            yield _sse(_turn_payload(session_id, session, result), event="done")
+        except RuntimeError as e:
+            yield _sse({"error": str(e)}, event="error")
+        finally:
+            # On client disconnect this finishes the turn server-side
+            stream.close()
+
+    return Response(stream_with_context(_events()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 @app.route("/api/session/status", methods=["GET"])
@@ -534,6 +687,7 @@ def download_log():
     # Fall back to disk (past session)
     safe_sid = "".join(c for c in session_id if c.isalnum() or c == "-")[:40]
     log_path = LOG_DIR / f"session_{safe_sid}.json"
+    flush_log(log_path)
     if log_path.exists():
         return send_file(str(log_path), as_attachment=True,
                          download_name=log_path.name)
@@ -695,17 +849,23 @@ def list_logs():
         # Walk all project files to find sessions belonging to this project
         for pf in PROJECTS_DIR.glob("*.json"):
             try:
-                pdata = json.loads(pf.read_text(encoding="utf-8"))
+                pdata = orjson.loads(pf.read_bytes())
             except Exception:
                 continue
             if pdata.get("id") == project_id and pdata.get("session_id"):
                 allowed_sids.add(pdata["session_id"])
 
+    # Log writes are queued; wait for the active session's own entries only.
+    # Other sessions' logs may trail by an in-flight entry, which is fine here.
+    if active_sid:
+        active = _sessions.peek(active_sid)
+        if active:
+            active["logger"].get_log_path()
     logs_meta = []
     for log_file in sorted(LOG_DIR.glob("session_*.json"),
                            key=lambda p: -p.stat().st_mtime):
         try:
-            raw = json.loads(log_file.read_text(encoding="utf-8"))
+            raw = read_log_entries(log_file)
         except Exception:
             continue
 
@@ -754,7 +914,7 @@ def list_logs():
                     req_ids_seen |= set(range(cnt))
 
         # Also try to read req count from the live in-memory session if available
-        live_session = _sessions.get(sid)
+        live_session = _sessions.peek(sid)
         if live_session:
             live_state = live_session.get("state")
             if live_state:
@@ -814,7 +974,7 @@ def replay_log(session_id: str):
     safe_sid = "".join(c for c in session_id if c.isalnum() or c == "-")[:40]
 
     # Try live in-memory session first — gives most up-to-date data
-    live = _sessions.get(safe_sid)
+    live = _sessions.peek(safe_sid)
     if live:
         state: ConversationState = live["state"]
         turns_out = [
@@ -845,11 +1005,12 @@ def replay_log(session_id: str):
 
     # Fall back to reading the log file from disk
     log_path = LOG_DIR / f"session_{safe_sid}.json"
+    flush_log(log_path)
     if not log_path.exists():
         return jsonify({"error": f"Log for session '{safe_sid}' not found"}), 404
 
     try:
-        raw = json.loads(log_path.read_text(encoding="utf-8"))
+        raw = read_log_entries(log_path)
     except Exception as e:
         return jsonify({"error": f"Could not read log: {e}"}), 500
 
@@ -902,6 +1063,7 @@ def download_log_by_id(session_id: str):
     # Sanitise — session_ids are 8-char hex strings
     safe_sid = "".join(c for c in session_id if c.isalnum() or c == "-")[:40]
     log_path = LOG_DIR / f"session_{safe_sid}.json"
+    flush_log(log_path)
     if not log_path.exists():
         return jsonify({"error": f"Log for session '{safe_sid}' not found"}), 404
     return send_file(str(log_path), as_attachment=True, download_name=log_path.name)
@@ -911,9 +1073,16 @@ def download_log_by_id(session_id: str):
 # Routes — Utility
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=8)
+def _health_body(provider_name: str) -> bytes:
+    # Encoded once per provider name; health probes then skip JSON encoding.
+    return orjson.dumps({"status": "ok", "provider": provider_name, "version": "iteration-9"})
+
+
 @app.route("/api/health", methods=["GET"])
 def health():
-    return jsonify({"status": "ok", "provider": _provider_name, "version": "iteration-9"})
+    return Response(_health_body(_provider_name), mimetype="application/json",
+                    headers={"Cache-Control": "no-store"})
 
 
 @app.route("/", methods=["GET"])
@@ -942,20 +1111,28 @@ def main():
     global _provider_name, _provider_kwargs
     parser = argparse.ArgumentParser(description="RE Assistant Web UI — Iteration 9")
     parser.add_argument("--provider", choices=["openai", "stub", "ollama"], default="openai")
-    parser.add_argument("--model", default="gpt-4o")
+    parser.add_argument("--model", default=None,
+                        help="Model name (default: gpt-4o for openai, $OLLAMA_MODEL or "
+                             "llama3.1:8b-instruct-q4_K_M for ollama)")
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=5000)
     parser.add_argument("--debug", action="store_true")
     args = parser.parse_args()
 
     _provider_name = args.provider
-    if args.provider in ("openai", "ollama"):
+    if args.provider in ("openai", "ollama") and args.model:
         _provider_kwargs = {"model": args.model}
 
+    # Fail at startup on a missing API key rather than on the first session
+    try:
+        create_provider(_provider_name, **_provider_kwargs)
+    except Exception as e:
+        parser.error(f"cannot initialise provider '{_provider_name}': {e}")
+
     print(f"\n{'═'*60}")
     print(f"  RE Assistant — Iteration 9 | University of Hildesheim")
     print(f"  http://{args.host}:{args.port}")
-    print(f"  LLM: {_provider_name}  Model: {_provider_kwargs.get('model','N/A')}")
+    print(f"  LLM: {_provider_name}  Model: {_provider_kwargs.get('model','provider default')}")
     print(f"  Projects dir: {PROJECTS_DIR}")
     print(f"{'═'*60}\n")
 
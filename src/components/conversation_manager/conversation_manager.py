@@ -2,7 +2,7 @@ from __future__ import annotations
 import json, sys, uuid
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -24,9 +24,11 @@ from src.components.conversation_manager.llm_provider import LLMProvider
 from src.components.conversation_manager.session_logger import SessionLogger
 from src.components.conversation_manager.utils import (
     _message_similarity,
+    _trim_history,
     SMART_CHECK_PROMPT,
     TRANSITION_MSG,
     TRIGGER_MESSAGES,
+    PreparedTurn,
     SendTurnResult,
     SYSTEM_PROMPT_TRANS_1,
     SYSTEM_PROMPT_TRANS_2,
@@ -36,6 +38,7 @@ from src.components.conversation_manager.utils import (
 # ── Conversation Manager ──
 
 MAX_HISTORY_TURNS = 10   # IT9: reduced from 20 to keep context tight
+MAX_HISTORY_TOKENS = 6000  # estimated budget for history + user message (system message excluded)
 
 @dataclass
 class ConversationManager:
@@ -60,7 +63,7 @@ class ConversationManager:
         self._domain_discovery = create_domain_discovery(self.provider)
 
     def start_session(self) -> tuple:
-        session_id = str(uuid.uuid4())[:8]
+        session_id = uuid.uuid4().hex[:8]
         state = create_session(session_id)
         state.domain_gate = DomainGate()
         state.task_type = self.task_type
@@ -197,7 +200,7 @@ class ConversationManager:
             user_message: str,
             state: ConversationState,
             logger: SessionLogger
-        ) -> str:
+        ) -> SendTurnResult:
         """Process one conversation turn.
 
         PRE-CALL block (steps 1-3): everything the system prompt depends on must be
@@ -210,8 +213,80 @@ class ConversationManager:
         commit requirements, update domain statuses, run decomposition, sync
         templates, detect gaps, log.
         """
+        prepared = self._prepare_turn(user_message, state, logger)
+
+        # 3. LLM call
+        try:
+            assistant_response = self.provider.chat(
+                system_message=prepared.system_message,
+                messages=prepared.messages,
+                temperature=self.temperature)
+        except Exception as exc:
+            raise RuntimeError(f"LLM API error: {exc}") from exc
+
+        return self._complete_turn(user_message, assistant_response, prepared, state, logger)
+
+    def send_turn_stream(
+            self,
+            user_message: str,
+            state: ConversationState,
+            logger: SessionLogger
+        ) -> Iterator[str]:
+        """Streaming variant of send_turn().
+
+        Yields the assistant reply as text deltas while the LLM generates it,
+        then runs the same post-call processing as send_turn() on the joined
+        reply. The SendTurnResult is the generator's return value
+        (StopIteration.value), so callers can forward deltas as they arrive.
+
+        If the consumer closes the generator mid-reply (e.g. the browser went
+        away), the rest of the reply is still collected and the turn is
+        completed, as send_turn() would — _prepare_turn() has already updated
+        state (probe counts, domain seeding) for this turn. If the LLM fails
+        after that, no turn is recorded, the same as when it fails mid-stream
+        with the consumer still attached.
+        """
+        prepared = self._prepare_turn(user_message, state, logger)
+
+        chunks: list[str] = []
+        closed_early = False
+        try:
+            deltas = iter(self.provider.chat_stream(
+                system_message=prepared.system_message,
+                messages=prepared.messages,
+                temperature=self.temperature))
+            for delta in deltas:
+                chunks.append(delta)
+                try:
+                    yield delta
+                except GeneratorExit:
+                    closed_early = True  # no more yields allowed from here on
+                    break
+        except Exception as exc:
+            raise RuntimeError(f"LLM API error: {exc}") from exc
+
+        if closed_early:
+            # Collect the rest of the reply without yielding it. An LLM failure is
+            # handled as on the connected path: nothing is recorded for the turn,
+            # there is just no caller left to raise to.
+            try:
+                chunks.extend(deltas)
+            except Exception as exc:
+                print(f"[send_turn_stream] LLM API error after client disconnect: {exc}")
+                return None
+
+        return self._complete_turn(user_message, "".join(chunks), prepared, state, logger)
+
+    def _prepare_turn(
+            self,
+            user_message: str,
+            state: ConversationState,
+            logger: SessionLogger
+        ) -> PreparedTurn:
+        """PRE-CALL block of send_turn(): resolve context and build the LLM input."""
         # Capture phase BEFORE any processing - used to detect transitions in step 8
         phase_before = determine_elicitation_phase(state)
+        brief_summary = ""
 
         # ── PRE-CALL: resolve all context the system prompt depends on ────────
         next_turn_id = state.turn_count + 1  # what turn_count will be after add_turn()
@@ -349,18 +424,32 @@ class ConversationManager:
         current_phase = self._architect.get_current_phase(state)
         print(f"\n[Phase: {current_phase}] Turn {next_turn_id}\n[System prompt length: {len(system_msg)} chars]")
 
-        # 2. Assemble message history — use only last MAX_HISTORY_TURNS turns
-        history = state.get_message_history()[-(MAX_HISTORY_TURNS * 2):]
-        messages_to_send = history + [{"role": "user", "content": user_message}]
+        # 2. Assemble message history — use only last MAX_HISTORY_TURNS turns,
+        #    then drop the oldest of those if they exceed MAX_HISTORY_TOKENS
+        history = state.get_message_history(MAX_HISTORY_TURNS)
+        messages_to_send = _trim_history(
+            history + [{"role": "user", "content": user_message}], MAX_HISTORY_TOKENS)
+
+        return PreparedTurn(
+            phase_before=phase_before,
+            current_phase=current_phase,
+            brief_summary=brief_summary,
+            system_message=system_msg,
+            messages=messages_to_send,
+        )
 
-        # 3. LLM call
-        try:
-            assistant_response = self.provider.chat(
-                system_message=system_msg,
-                messages=messages_to_send,
-                temperature=self.temperature)
-        except Exception as exc:
-            raise RuntimeError(f"LLM API error: {exc}") from exc
+    def _complete_turn(
+            self,
+            user_message: str,
+            assistant_response: str,
+            prepared: PreparedTurn,
+            state: ConversationState,
+            logger: SessionLogger
+        ) -> SendTurnResult:
+        """POST-CALL block of send_turn(): process the reply and update state."""
+        phase_before = prepared.phase_before
+        current_phase = prepared.current_phase
+        brief_summary = prepared.brief_summary
 
         # ── POST-CALL: process LLM output and update state ────────────────────
         print(f"User message:\n{user_message}\n")
@@ -1,13 +1,58 @@
 from __future__ import annotations
+import hashlib
 import os
+import threading
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Iterator
+import orjson
 import requests
+from cachetools import LRUCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.components.conversation_manager.utils import estimate_tokens
+
+# One keep-alive connection pool for every OllamaProvider. The app builds a new
+# provider per session, so a per-instance pool would still pay a fresh TCP/TLS
+# handshake on the first call of every session.
+_HTTP_SESSION = requests.Session()
+
+# Sized for concurrent sessions plus the parallel SRS fills. Gateway errors
+# (502/503/504) and failed connects are retried with backoff; POST is included
+# because every Ollama call is a POST. Read timeouts are never retried (read=0):
+# the server may still be generating, and a retry would queue a duplicate
+# generation. After the last retry the response is returned as-is, so
+# raise_for_status() still reports the real HTTP error.
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, read=0, backoff_factor=0.2, status_forcelist=[502, 503, 504],
+                      allowed_methods=frozenset({"GET", "POST"}), raise_on_status=False),
+)
+_HTTP_SESSION.mount("http://", _HTTP_ADAPTER)
+_HTTP_SESSION.mount("https://", _HTTP_ADAPTER)
+
+# Replies to identical low-temperature prompts, shared by every CachedProvider.
+# LLM_CACHE_SIZE=0 disables caching.
+_RESPONSE_CACHE: LRUCache = LRUCache(maxsize=int(os.getenv("LLM_CACHE_SIZE", "512")))
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+# 4-bit quantised instruct build: about half the memory traffic of the f16 default
+# and roughly twice the decode speed. OLLAMA_MODEL or --model picks another tag.
+DEFAULT_OLLAMA_MODEL = "llama3.1:8b-instruct-q4_K_M"
 
 
 class LLMProvider(ABC):
     @abstractmethod
     def chat(self, system_message: str, messages: list[dict[str, str]],
              temperature: float = 0.0) -> str: ...
+
+    def chat_stream(self, system_message: str, messages: list[dict[str, str]],
+                    temperature: float = 0.0) -> Iterator[str]:
+        """Yield the reply as text deltas. Providers without streaming yield it whole."""
+        yield self.chat(system_message, messages, temperature)
+
     @property
     @abstractmethod
     def model_name(self) -> str: ...
@@ -32,32 +77,79 @@ class OpenAIProvider(LLMProvider):
             model=self._model, messages=full, temperature=temperature)
         return r.choices[0].message.content or ""
 
+    def chat_stream(self, system_message, messages, temperature=0.0):
+        full = [{"role": "system", "content": system_message}] + messages
+        stream = self._client.chat.completions.create(
+            model=self._model, messages=full, temperature=temperature, stream=True)
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+@lru_cache(maxsize=4)
+def _ollama_headers(api_key: str) -> dict[str, str]:
+    # Built once per key and shared by every OllamaProvider; don't mutate it.
+    return {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
+
 
 class OllamaProvider(LLMProvider):
-    def __init__(self, model="llama3.1:8b", timeout=120):
+    def __init__(self, model=None, timeout=120):
         api_key = os.getenv("OLLAMA_API_KEY")
         if not api_key:
             raise EnvironmentError("OLLAMA_API_KEY not set.")
         base_url = os.getenv("OLLAMA_BASE_URL", "https://genai-01.uni-hildesheim.de/ollama")
-        self._model = model
+        self._model = model or os.getenv("OLLAMA_MODEL", DEFAULT_OLLAMA_MODEL)
         self.api_endpoint = f"{base_url}/api/chat"
-        self.headers = {"Content-Type": "application/json",
-                        "Authorization": f"Bearer {api_key}"}
+        self.headers = _ollama_headers(api_key)
         self.timeout = timeout
+        self.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
 
     @property
     def model_name(self):
         return self._model
 
+    def _payload(self, system_message, messages, temperature, stream):
+        # keep_alive holds the model (and its prompt cache) in memory between
+        # turns; num_keep protects the system-message tokens when the context
+        # window shifts, so a long session doesn't re-prefill them.
+        # Callers send it pre-encoded with orjson (data=) rather than json=,
+        # which would re-serialise it with stdlib json.
+        return {"model": self._model,
+                "messages": [{"role": "system", "content": system_message}] + messages,
+                "options": {"temperature": temperature,
+                            "num_keep": estimate_tokens(system_message)},
+                "keep_alive": self.keep_alive,
+                "stream": stream}
+
     def chat(self, system_message, messages, temperature=0.0):
-        full = [{"role": "system", "content": system_message}] + messages
-        r = requests.post(
+        r = _HTTP_SESSION.post(
             self.api_endpoint, headers=self.headers,
-            json={"model": self._model, "messages": full,
-                  "options": {"temperature": temperature}, "stream": False},
+            data=orjson.dumps(self._payload(system_message, messages, temperature, stream=False)),
             timeout=self.timeout)
         r.raise_for_status()
-        return r.json()["message"]["content"] or ""
+        return orjson.loads(r.content)["message"]["content"] or ""
+
+    def chat_stream(self, system_message, messages, temperature=0.0):
+        with _HTTP_SESSION.post(
+                self.api_endpoint, headers=self.headers,
+                data=orjson.dumps(self._payload(system_message, messages, temperature, stream=True)),
+                timeout=self.timeout, stream=True) as r:
+            r.raise_for_status()
+            # Ollama streams one JSON object per line; the last one has done=true.
+            # Mid-stream failures arrive as an {"error": ...} line on a 200 response.
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(f"Ollama stream error: {chunk['error']}")
+                content = chunk.get("message", {}).get("content")
+                if content:
+                    yield content
+                if chunk.get("done"):
+                    return
+            # No done frame: the reply was cut off, don't pass it off as complete
+            raise RuntimeError("Ollama stream ended before the reply was done")
 
 
 class StubProvider(LLMProvider):
@@ -82,11 +174,71 @@ class StubProvider(LLMProvider):
         return r
 
 
+class CachedProvider(LLMProvider):
+    """Serves repeated prompts from an in-memory LRU instead of calling the model.
+
+    Only calls at or below max_temperature are cached, so sampled replies keep
+    their variability. The key covers the model, system message, messages and
+    temperature.
+    """
+
+    def __init__(self, provider: LLMProvider, cache: LRUCache | None = None,
+                 max_temperature: float = 0.3):
+        self._provider = provider
+        self._cache = _RESPONSE_CACHE if cache is None else cache
+        self.max_temperature = max_temperature
+
+    @property
+    def model_name(self):
+        return self._provider.model_name
+
+    def _key(self, system_message, messages, temperature) -> bytes:
+        raw = orjson.dumps([self.model_name, system_message, messages, temperature],
+                           option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    def _lookup(self, key):
+        with _RESPONSE_CACHE_LOCK:
+            return self._cache.get(key)
+
+    def _store(self, key, reply):
+        if not reply or self._cache.maxsize <= 0:
+            return  # an empty reply is more likely a glitch than an answer
+        with _RESPONSE_CACHE_LOCK:
+            self._cache[key] = reply
+
+    def chat(self, system_message, messages, temperature=0.0):
+        if temperature > self.max_temperature:
+            return self._provider.chat(system_message, messages, temperature)
+        key = self._key(system_message, messages, temperature)
+        reply = self._lookup(key)
+        if reply is None:
+            reply = self._provider.chat(system_message, messages, temperature)
+            self._store(key, reply)
+        return reply
+
+    def chat_stream(self, system_message, messages, temperature=0.0):
+        if temperature > self.max_temperature:
+            yield from self._provider.chat_stream(system_message, messages, temperature)
+            return
+        key = self._key(system_message, messages, temperature)
+        reply = self._lookup(key)
+        if reply is not None:
+            yield reply
+            return
+        chunks = []
+        for delta in self._provider.chat_stream(system_message, messages, temperature):
+            chunks.append(delta)
+            yield delta
+        # Only reached once the inner stream finished: a reply cut off by an error
+        # or an early close() is never cached
+        self._store(key, "".join(chunks))
+
+
 def create_provider(name="ollama", **kwargs):
-    if name == "openai":
-        return OpenAIProvider(**kwargs)
-    elif name == "ollama":
-        return OllamaProvider(**kwargs)
+    if name in ("openai", "ollama"):
+        provider = OpenAIProvider(**kwargs) if name == "openai" else OllamaProvider(**kwargs)
+        return CachedProvider(provider) if _RESPONSE_CACHE.maxsize > 0 else provider
     elif name == "stub":
         return StubProvider(**kwargs)
     raise ValueError(f"Unknown provider: {name!r}")
\ No newline at end of file
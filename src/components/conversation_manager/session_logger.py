@@ -1,19 +1,77 @@
 from __future__ import annotations
-import json, time, sys
+import atexit, json, os, queue, threading, time, sys
+import orjson
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+# The log file stays a valid JSON array; every entry is spliced in before this
+# closing tail, so a turn writes only its own entry instead of the whole log.
+_TAIL = b"\n]\n"
+
+# Log entries are written by one background thread, so a turn's response never
+# waits on disk. Entries are serialised by the caller (they may reference state
+# that changes later) and written in the order they were queued.
+_WRITE_QUEUE: "queue.Queue[tuple[SessionLogger, bytes]]" = queue.Queue()
+_WRITER: threading.Thread | None = None
+_WRITER_LOCK = threading.Lock()
+
+# Queued-but-unwritten entries per log file, so a reader waits only for the
+# file it reads rather than for every session's pending writes.
+_PENDING: dict[Path, int] = {}
+_PENDING_COND = threading.Condition()
+
+
+def _writer_loop():
+    while True:
+        logger, line = _WRITE_QUEUE.get()
+        try:
+            logger._write(line)
+        finally:
+            with _PENDING_COND:
+                left = _PENDING[logger._log_path] - 1
+                if left:
+                    _PENDING[logger._log_path] = left
+                else:
+                    del _PENDING[logger._log_path]
+                _PENDING_COND.notify_all()
+            _WRITE_QUEUE.task_done()
+
+
+def _enqueue(logger: "SessionLogger", line: bytes):
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None or not _WRITER.is_alive():
+            _WRITER = threading.Thread(target=_writer_loop, name="session-log-writer",
+                                       daemon=True)
+            _WRITER.start()
+    with _PENDING_COND:
+        _PENDING[logger._log_path] = _PENDING.get(logger._log_path, 0) + 1
+    _WRITE_QUEUE.put((logger, line))
+
+
+def flush_log(path: Path):
+    """Block until every entry queued so far for the log at path is on disk."""
+    with _PENDING_COND:
+        _PENDING_COND.wait_for(lambda: path not in _PENDING)
+
+
+def flush_logs():
+    """Block until every queued log entry has been written to disk."""
+    _WRITE_QUEUE.join()
+
+
+atexit.register(flush_logs)
+
 class SessionLogger:
     def __init__(self, log_dir: Path, session_id: str):
         log_dir.mkdir(parents=True, exist_ok=True)
         self._log_path = log_dir / f"session_{session_id}.json"
-        self._entries: list[dict] = []
+        self._count = 0
 
     def log_event(self, event_type, data):
-        self._entries.append({"timestamp": time.time(),
-                               "event_type": event_type, "data": data})
-        self._flush()
+        self._append({"timestamp": time.time(),
+                      "event_type": event_type, "data": data})
 
     def log_turn(self, turn_id, user_msg, assistant_msg, categories_updated,
                  gap_report_dict=None):
@@ -22,19 +80,61 @@ class SessionLogger:
                 "categories_updated": categories_updated}
         if gap_report_dict:
             data["gap_report"] = gap_report_dict
-        self._entries.append({"timestamp": time.time(),
-                               "event_type": "turn", "data": data})
-        self._flush()
+        self._append({"timestamp": time.time(),
+                      "event_type": "turn", "data": data})
 
     def log_session_end(self, state):
         self.log_event("session_end", state.get_coverage_report())
 
     def get_log_path(self) -> Path:
+        """Path of the log file, with every entry queued so far written out."""
+        flush_log(self._log_path)
         return self._log_path
 
-    def _flush(self):
+    def _append(self, entry):
+        try:
+            line = orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS)
+        except Exception:
+            return
+        _enqueue(self, line)
+
+    def _write(self, line: bytes):
         try:
-            with open(self._log_path, "w", encoding="utf-8") as f:
-                json.dump(self._entries, f, indent=2, ensure_ascii=False)
+            if self._count == 0:
+                with open(self._log_path, "wb") as f:
+                    f.write(b"[\n" + line + _TAIL)
+            else:
+                with open(self._log_path, "r+b") as f:
+                    f.seek(-len(_TAIL), os.SEEK_END)
+                    if f.read(len(_TAIL)) != _TAIL:
+                        return  # file was rewritten by someone else; don't corrupt it
+                    f.seek(-len(_TAIL), os.SEEK_END)
+                    f.write(b",\n" + line + _TAIL)
+            self._count += 1
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+
+def read_log_entries(path: Path) -> list[dict]:
+    """Read a session log written by SessionLogger.
+
+    Entries are parsed one line at a time, so a log whose last write was cut
+    off (no closing bracket, half an entry) still yields every complete entry.
+    Logs in any other layout (older indented, compact one-line) are parsed as
+    a whole.
+    """
+    raw = path.read_bytes()
+    lines = [ln.strip().rstrip(b",") for ln in raw.splitlines()]
+    lines = [ln for ln in lines if ln not in (b"", b"[", b"]")]
+    entries = []
+    for i, line in enumerate(lines):
+        try:
+            entry = orjson.loads(line)
+        except ValueError:
+            if i == len(lines) - 1 and line.startswith(b'{"'):
+                break  # torn last entry from an interrupted write
+            return json.loads(raw)  # not one-entry-per-line: older layout
+        if not isinstance(entry, dict):
+            return json.loads(raw)  # a whole array on one line, not an entry
+        entries.append(entry)
+    return entries
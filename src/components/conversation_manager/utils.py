@@ -9,6 +9,30 @@ def _message_similarity(a: str, b: str) -> float:
         return 0.0
     return len(wa & wb) / len(wa | wb)
 
+# ── History token budget ──
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text; good enough for budgeting
+    return len(text or "") // 4 + 1
+
+def _trim_history(messages: list[dict], max_tokens: int) -> list[dict]:
+    """Drop the oldest user/assistant pairs until messages fit in max_tokens.
+
+    The last message (the current user turn) is always kept, and the trimmed
+    list always starts with a user message.
+    """
+    costs = [estimate_tokens(m.get("content", "")) for m in messages]
+    total = sum(costs)
+    start, last = 0, len(messages) - 1
+    while total > max_tokens and start < last:
+        total -= costs[start]
+        start += 1
+        # don't leave an assistant reply without the question it answers
+        while start < last and messages[start].get("role") != "user":
+            total -= costs[start]
+            start += 1
+    return messages[start:]
+
 # ── SMART Quality Check ──
 
 SMART_CHECK_PROMPT = """\
@@ -76,6 +100,16 @@ class SendTurnResult:
     new_phase:          str   = ""
 
 
+@dataclass
+class PreparedTurn:
+    """LLM input and pre-call context shared by send_turn() and send_turn_stream()."""
+    phase_before:   str
+    current_phase:  str
+    brief_summary:  str
+    system_message: str
+    messages:       list[dict[str, str]] = field(default_factory=list)
+
+
 SYSTEM_PROMPT_TRANS_1 = """\
     You are a helpful and precise assistant for requirements engineering. 
     The elicitation phase has just transitioned from {from_phase} to {to_phase}. 
@@ -272,9 +272,16 @@ class ConversationState:
     def to_json(self):
         return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
 
-    def get_message_history(self):
+    def get_message_history(self, max_turns=None):
+        # Slice the turns first so a windowed caller only copies the turns it sends
+        if max_turns is None:
+            turns = self.turns
+        elif max_turns > 0:
+            turns = self.turns[-max_turns:]
+        else:
+            turns = []
         msgs = []
-        for t in self.turns:
+        for t in turns:
             msgs.append({"role":"user","content":t.user_message})
             msgs.append({"role":"assistant","content":t.assistant_message})
         return msgs
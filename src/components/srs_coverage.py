@@ -1,5 +1,6 @@
 from __future__ import annotations
 import re
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from src.components.conversation_state import RequirementType
 from src.components.srs_template import UserClass
@@ -66,14 +67,35 @@ def _user_turns_text(state: "ConversationState", max_turns: int = 12, max_chars:
     return "\n".join(lines)
 
 
+def _substring_pattern(keywords) -> re.Pattern:
+    """Case-insensitive alternation matching any keyword anywhere in the text
+    (same semantics as `kw in text.lower()`, but one scan for all keywords)."""
+    return re.compile("|".join(re.escape(kw) for kw in sorted(keywords)), re.IGNORECASE)
+
+
+_EXCLUSION_PATTERN = _substring_pattern({"out of scope", "shall not", "permanently"})
+
+_DATA_KEYWORDS = frozenset({"history", "log", "record", "store", "save", "schedule",
+                            "account", "profile", "report", "track", "monitor", "daily"})
+_DATA_PATTERN = _substring_pattern(_DATA_KEYWORDS)
+
+# Interface type → categories/keywords that make a requirement relevant to it
+_INTERFACE_KEYWORDS: dict[str, frozenset[str]] = {
+    "User Interfaces":          frozenset({"usability", "ui", "screen", "display", "app",
+                                           "notification", "mobile", "interface"}),
+    "Software Interfaces":      frozenset({"compatibility", "security_privacy", "api",
+                                           "authentication", "maintainability"}),
+    "Communication Interfaces": frozenset({"performance", "reliability", "notification",
+                                           "email", "network", "communication"}),
+}
+_INTERFACE_PATTERNS = {k: _substring_pattern(v) for k, v in _INTERFACE_KEYWORDS.items()}
+
+
 def _exclusions_text(state: "ConversationState") -> str:
     lines = []
     for req in state.requirements.values():
-        if req.req_type == RequirementType.CONSTRAINT and (
-            "out of scope" in req.text.lower() or
-            "shall not" in req.text.lower() or
-            "permanently" in req.text.lower()
-        ):
+        if (req.req_type == RequirementType.CONSTRAINT and
+                _EXCLUSION_PATTERN.search(req.text)):
             lines.append(f"- {req.text}")
     return "\n".join(lines) if lines else "(no explicit exclusions recorded)"
 
@@ -112,11 +134,9 @@ def _brief_block(state: "ConversationState") -> str:
 
 def _implied_data_reqs(state: "ConversationState") -> str:
     """Find requirements that strongly imply data persistence."""
-    keywords = {"history", "log", "record", "store", "save", "schedule",
-                "account", "profile", "report", "track", "monitor", "daily"}
     lines = []
     for req in state.requirements.values():
-        if any(kw in req.text.lower() for kw in keywords):
+        if _DATA_PATTERN.search(req.text):
             lines.append(f"- [{req.req_id}] {req.text}")
         if len(lines) >= 10:
             break
@@ -140,6 +160,7 @@ class SRSCoverageEnricher:
     provider: object   # LLMProvider — typed as object to avoid circular import
     temperature: float = 0.1   # Slightly > 0 for natural prose; still deterministic-ish
     skip_high_risk_llm: bool = True   # If True, high-risk sections get stubs, not LLM fill
+    max_workers: int = 4   # Concurrent LLM fills; keep <= provider parallelism (OLLAMA_NUM_PARALLEL)
 
     def enrich(
         self,
@@ -162,6 +183,16 @@ class SRSCoverageEnricher:
         filled: dict[str, str] = {}
         sec = state.srs_section_content  # shorthand
 
+        # ── LLM FILLS: the synthesis calls are independent, so run them
+        #    concurrently up front; each section below collects its result ──
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = self._start_llm_fills(pool, template, state)
+            product_functions = (
+                None if template.section2.product_functions
+                else self._fill_product_functions(state, pool)
+            )
+        llm = {key: future.result() for key, future in pending.items()}
+
         # ── PHASE 4 CONTENT: apply customer-provided section content first ───
 
         # §1.2 Scope
@@ -170,7 +201,7 @@ class SRSCoverageEnricher:
                 template.section1.scope = sec["1.2"]
                 filled["§1.2 Scope"] = "phase4"
             else:
-                template.section1.scope = self._fill_scope(state)
+                template.section1.scope = llm["1.2"]
                 filled["§1.2 Scope"] = "llm_synthesis"
 
         # §2.1 Product Perspective
@@ -179,12 +210,12 @@ class SRSCoverageEnricher:
                 template.section2.product_perspective = sec["2.1"]
                 filled["§2.1 Product Perspective"] = "phase4"
             else:
-                template.section2.product_perspective = self._fill_perspective(state)
+                template.section2.product_perspective = llm["2.1"]
                 filled["§2.1 Product Perspective"] = "llm_synthesis"
 
         # §2.2 Product Functions — always LLM synthesis (not a Phase 4 section)
         if not template.section2.product_functions:
-            template.section2.product_functions = self._fill_product_functions(state)
+            template.section2.product_functions = product_functions
             filled["§2.2 Product Functions"] = "llm_synthesis"
 
         # §2.3 User Classes
@@ -193,7 +224,7 @@ class SRSCoverageEnricher:
                 uc_text = sec["2.3"]
                 filled["§2.3 User Classes"] = "phase4"
             else:
-                uc_text = self._fill_user_classes(state)
+                uc_text = llm["2.3"]
                 filled["§2.3 User Classes"] = "llm_synthesis"
             template.section2.user_classes = [
                 UserClass(name="User Classes Summary", description=uc_text,
@@ -206,7 +237,7 @@ class SRSCoverageEnricher:
                 gc_text = sec["2.4"]
                 filled["§2.4 General Constraints"] = "phase4"
             else:
-                gc_text = self._fill_general_constraints(state)
+                gc_text = llm["2.4"]
                 filled["§2.4 General Constraints"] = "llm_synthesis"
             template.section2.general_constraints = [gc_text]
 
@@ -220,7 +251,7 @@ class SRSCoverageEnricher:
                 template.section2.assumptions = items if items else [raw]
                 filled["§2.5 Assumptions & Dependencies"] = "phase4"
             else:
-                template.section2.assumptions = self._fill_assumptions(state)
+                template.section2.assumptions = llm["2.5"]
                 filled["§2.5 Assumptions & Dependencies"] = "llm_synthesis"
 
         # §3.1.1 User Interfaces
@@ -229,9 +260,7 @@ class SRSCoverageEnricher:
                 template.section3.interfaces.user_interfaces = [sec["3.1.1"]]
                 filled["§3.1.1 User Interfaces"] = "phase4"
             else:
-                ui_text = self._fill_interface(state, "User Interfaces",
-                    "screen layouts, navigation patterns, accessibility, input methods")
-                template.section3.interfaces.user_interfaces = [ui_text]
+                template.section3.interfaces.user_interfaces = [llm["3.1.1"]]
                 filled["§3.1.1 User Interfaces"] = "llm_synthesis"
 
         # §3.1.2 Hardware Interfaces — always stub (high risk)
@@ -252,10 +281,7 @@ class SRSCoverageEnricher:
                 template.section3.interfaces.software_interfaces = [sec["3.1.3"]]
                 filled["§3.1.3 Software Interfaces"] = "phase4"
             else:
-                sw_text = self._fill_interface(state, "Software Interfaces",
-                    "operating system APIs, notification services, authentication providers, "
-                    "third-party data services")
-                template.section3.interfaces.software_interfaces = [sw_text]
+                template.section3.interfaces.software_interfaces = [llm["3.1.3"]]
                 filled["§3.1.3 Software Interfaces"] = "llm_synthesis"
 
         # §3.1.4 Communication Interfaces
@@ -264,10 +290,7 @@ class SRSCoverageEnricher:
                 template.section3.interfaces.communication_interfaces = [sec["3.1.4"]]
                 filled["§3.1.4 Communication Interfaces"] = "phase4"
             else:
-                comm_text = self._fill_interface(state, "Communication Interfaces",
-                    "network protocols (HTTP/HTTPS, WebSocket, MQTT), data formats (JSON, XML), "
-                    "push notification channels, email delivery")
-                template.section3.interfaces.communication_interfaces = [comm_text]
+                template.section3.interfaces.communication_interfaces = [llm["3.1.4"]]
                 filled["§3.1.4 Communication Interfaces"] = "llm_synthesis"
 
         # §3.4 Logical Database Requirements — always stub (high risk)
@@ -287,6 +310,44 @@ class SRSCoverageEnricher:
 
         return filled
 
+    def _start_llm_fills(
+        self,
+        pool: Executor,
+        template: "SRSTemplate",
+        state: "ConversationState",
+    ) -> dict[str, Future]:
+        """
+        Submit the LLM fill for every section that is still empty and has no
+        Phase 4 content. Returns section number → future of the filled value.
+        """
+        sec = state.srs_section_content
+        interfaces = template.section3.interfaces
+        jobs = {
+            "1.2": (template.section1.scope,
+                    lambda: self._fill_scope(state)),
+            "2.1": (template.section2.product_perspective,
+                    lambda: self._fill_perspective(state)),
+            "2.3": (template.section2.user_classes,
+                    lambda: self._fill_user_classes(state)),
+            "2.4": (template.section2.general_constraints,
+                    lambda: self._fill_general_constraints(state)),
+            "2.5": (template.section2.assumptions,
+                    lambda: self._fill_assumptions(state)),
+            "3.1.1": (interfaces.user_interfaces,
+                      lambda: self._fill_interface(state, "User Interfaces",
+                          "screen layouts, navigation patterns, accessibility, input methods")),
+            "3.1.3": (interfaces.software_interfaces,
+                      lambda: self._fill_interface(state, "Software Interfaces",
+                          "operating system APIs, notification services, authentication providers, "
+                          "third-party data services")),
+            "3.1.4": (interfaces.communication_interfaces,
+                      lambda: self._fill_interface(state, "Communication Interfaces",
+                          "network protocols (HTTP/HTTPS, WebSocket, MQTT), data formats (JSON, XML), "
+                          "push notification channels, email delivery")),
+        }
+        return {key: pool.submit(fill) for key, (current, fill) in jobs.items()
+                if not current and not sec.get(key)}
+
     # ------------------------------------------------------------------
     # Low-risk LLM fills (synthesis from elicited data)
     # ------------------------------------------------------------------
@@ -312,7 +373,11 @@ class SRSCoverageEnricher:
         )
         return self._call_llm(prompt, max_tokens=350)
 
-    def _fill_product_functions(self, state: "ConversationState") -> list[str]:
+    def _fill_product_functions(
+        self,
+        state: "ConversationState",
+        pool: Executor | None = None,
+    ) -> list[str]:
         """
         Generate a formal §2.2 Product Functions entry for each confirmed or
         partially-elicited domain in the domain gate.
@@ -335,13 +400,16 @@ class SRSCoverageEnricher:
         If the domain gate was never seeded (should not happen post-gate-check
         but handled defensively), falls back to one representative FR per
         unique category key — same as the old Python-only behaviour.
+
+        When a pool is given, the per-domain calls run on it concurrently;
+        results keep the domain gate order either way.
         """
 
         gate = state.domain_gate
 
         # ── Path A: domain gate seeded — one LLM call per domain ─────────
         if gate is not None and gate.seeded and gate.total > 0:
-            results: list[str] = []
+            prompts: list[str] = []
             for domain_key, domain in gate.domains.items():
                 if domain.status == "excluded":
                     continue  # excluded features do not appear in §2.2
@@ -372,18 +440,17 @@ class SRSCoverageEnricher:
                 req_lines = "\n".join(
                     f"- [{r.req_id}] {r.text}" for r in domain_reqs
                 )
-                prompt = PRODUCT_FUNCTIONS_DOMAIN_PROMPT.format(
+                prompts.append(PRODUCT_FUNCTIONS_DOMAIN_PROMPT.format(
                     project_name=state.project_name,
                     domain_label=domain.label,
                     domain_status=domain.status,
                     req_count=len(domain_reqs),
                     domain_reqs=req_lines,
-                )
-                description = self._call_llm(prompt, max_tokens=200)
-                results.append(description)
+                ))
 
-            if results:
-                return results
+            if prompts:
+                call_map = pool.map if pool is not None else map
+                return list(call_map(lambda p: self._call_llm(p, max_tokens=200), prompts))
 
         # ── Path B: fallback — one representative FR per category key ─────
         category_reps: dict[str, str] = {}
@@ -439,19 +506,12 @@ class SRSCoverageEnricher:
         architect_checklist: str,
     ) -> str:
         # Find requirements relevant to this interface type
-        keywords = {
-            "User Interfaces":          ["usability", "ui", "screen", "display", "app",
-                                         "notification", "mobile", "interface"],
-            "Software Interfaces":      ["compatibility", "security_privacy", "api",
-                                         "authentication", "maintainability"],
-            "Communication Interfaces": ["performance", "reliability", "notification",
-                                         "email", "network", "communication"],
-        }
-        relevant_cats = keywords.get(interface_type, [])
+        relevant_cats = _INTERFACE_KEYWORDS.get(interface_type, frozenset())
+        pattern = _INTERFACE_PATTERNS.get(interface_type)
         relevant_reqs_lines = []
         for req in state.requirements.values():
             if (req.category in relevant_cats or
-                    any(kw in req.text.lower() for kw in relevant_cats)):
+                    (pattern is not None and pattern.search(req.text))):
                 relevant_reqs_lines.append(f"- [{req.req_id}] {req.text}")
             if len(relevant_reqs_lines) >= 15:
                 break
@@ -12,6 +12,10 @@ from src.components.system_prompt.prompt_architect import IEEE830_CATEGORIES, MA
 from src.components.domain_discovery.domain_discovery import NFR_CATEGORIES
 from src.components.srs_coverage import render_section2_extras, render_section35_stub
 
+# Buffer size for SRS file writes: 128 KiB, the coreutils io_blksize minimum.
+# A large SRS goes out in a few write() calls instead of many small ones.
+WRITE_BUFFER_SIZE_BYTES = 131072
+
 
 # ---------------------------------------------------------------------------
 # Formatting helpers
@@ -141,6 +145,10 @@ class SRSFormatter:
 
     def to_markdown(self, template: SRSTemplate, state: ConversationState) -> str:
         """Render a complete IEEE-830 Markdown SRS document."""
+        return "\n".join(self._render_lines(template, state))
+
+    def _render_lines(self, template: SRSTemplate, state: ConversationState) -> list[str]:
+        """Render the Markdown SRS as a list of lines (joined with newlines)."""
         lines: list[str] = []
 
         self._render_header(lines, template, state)
@@ -154,7 +162,7 @@ class SRSFormatter:
         if self.show_transcript_summary:
             self._render_appendix_c(lines, state)
 
-        return "\n".join(lines)
+        return lines
 
     def to_plain_text(self, template: SRSTemplate, state: ConversationState) -> str:
         """
@@ -189,8 +197,12 @@ class SRSFormatter:
             ts = time.strftime("%Y%m%d_%H%M%S")
             filename = f"SRS_{template.session_id}_{ts}.md"
         path = output_dir / filename
-        content = self.to_markdown(template, state)
-        path.write_text(content, encoding="utf-8")
+        lines = iter(self._render_lines(template, state))
+        # Lines are encoded straight into the write buffer, so the document is
+        # never held as one joined str plus one encoded bytes copy.
+        with open(path, "wb", buffering=WRITE_BUFFER_SIZE_BYTES) as f:
+            f.write(next(lines, "").encode("utf-8"))
+            f.writelines(("\n" + line).encode("utf-8") for line in lines)
         return path
 
     # ------------------------------------------------------------------
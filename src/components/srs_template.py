@@ -511,13 +511,22 @@ class SRSTemplate:
 # SMART heuristic checker
 # ---------------------------------------------------------------------------
 
+def _word_pattern(words) -> re.Pattern:
+    """Compile a case-insensitive, word-bounded alternation of the given words."""
+    return re.compile(r"\b(?:" + "|".join(re.escape(w) for w in sorted(words)) + r")\b",
+                      re.IGNORECASE)
+
+
 # Vague words that indicate a requirement is NOT measurable / specific
-_VAGUE_WORDS = {
+_VAGUE_WORDS = frozenset({
     "simple", "easy", "fast", "quickly", "good", "better", "best", "nice",
     "friendly", "modern", "clean", "robust", "scalable", "flexible",
     "intuitive", "seamless", "powerful", "efficient", "effective",
     "comprehensive", "appropriate", "adequate", "reasonable", "suitable",
-}
+})
+# The blocklist as one word-bounded alternation, so a requirement is scanned once
+# and punctuation-attached words ("fast,", "intuitive.") are caught too.
+_VAGUE_PATTERN = _word_pattern(_VAGUE_WORDS)
 
 # Measurable patterns — numbers, units, percentages
 _MEASURABLE_PATTERNS = [
@@ -531,6 +540,11 @@ _MEASURABLE_PATTERNS = [
     r"greater\s+than\s+\d+",
     r"\d{4}",     # year
 ]
+# All measurable patterns folded into one alternation: one scan per requirement
+# instead of one re.search() per pattern.
+_MEASURABLE_PATTERN = re.compile(
+    "|".join(f"(?:{p})" for p in _MEASURABLE_PATTERNS), re.IGNORECASE
+)
 
 # "shall" pattern — IEEE-830 canonical form
 _SHALL_PATTERN = re.compile(r"\bshall\b", re.IGNORECASE)
@@ -557,9 +571,6 @@ def _heuristic_smart_check(text: str) -> SmartAnnotation:
     RELEVANT    → heuristically assume True unless clearly a meta-comment
     """
     ann = SmartAnnotation()
-    lower = text.lower().strip()
-    words = set(lower.split())
-
     # SPECIFIC: actor-subject present
     if _ACTOR_PATTERN.match(text.strip()):
         ann.satisfied.add(SmartFlag.SPECIFIC)
@@ -567,7 +578,7 @@ def _heuristic_smart_check(text: str) -> SmartAnnotation:
         ann.violated.add(SmartFlag.SPECIFIC)
 
     # MEASURABLE: contains numeric constraint
-    if any(re.search(p, text, re.IGNORECASE) for p in _MEASURABLE_PATTERNS):
+    if _MEASURABLE_PATTERN.search(text):
         ann.satisfied.add(SmartFlag.MEASURABLE)
     else:
         ann.violated.add(SmartFlag.MEASURABLE)
@@ -580,7 +591,7 @@ def _heuristic_smart_check(text: str) -> SmartAnnotation:
         ann.notes += "Requirement is not in IEEE 'shall' form. "
 
     # UNAMBIGUOUS: no vague words
-    vague_found = _VAGUE_WORDS & words
+    vague_found = {w.lower() for w in _VAGUE_PATTERN.findall(text)}
     if not vague_found:
         ann.satisfied.add(SmartFlag.UNAMBIGUOUS)
     else:
@@ -629,15 +640,11 @@ def _map_category_to_section(req: Requirement) -> str:
 # Priority inference
 # ---------------------------------------------------------------------------
 
-_MUST_KEYWORDS = {"shall", "must", "required", "mandatory", "critical", "essential"}
-_NICE_KEYWORDS = {"nice", "optionally", "optional", "consider", "future", "later"}
+_MUST_KEYWORDS = frozenset({"shall", "must", "required", "mandatory", "critical", "essential"})
+_NICE_KEYWORDS = frozenset({"nice", "optionally", "optional", "consider", "future", "later"})
 
-_NICE_PATTERN = re.compile(
-    r"\b(?:nice|optionally|optional|consider|future|later)\b", re.IGNORECASE
-)
-_MUST_PATTERN = re.compile(
-    r"\b(?:shall|must|required|mandatory|critical|essential)\b", re.IGNORECASE
-)
+_NICE_PATTERN = _word_pattern(_NICE_KEYWORDS)
+_MUST_PATTERN = _word_pattern(_MUST_KEYWORDS)
 
 
 def _infer_priority(req: Requirement) -> str:
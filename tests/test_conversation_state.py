@@ -345,4 +345,21 @@ class TestMessageHistory:
         assert history[3] == {"role": "assistant",  "content": "assistant msg 2"}
 
     def test_empty_history_returns_empty_list(self):
-        assert _state().get_message_history() == []
\ No newline at end of file
+        assert _state().get_message_history() == []
+
+    def test_max_turns_keeps_latest_turns(self):
+        state = _state()
+        for i in range(5):
+            state.add_turn(f"user msg {i}", f"assistant msg {i}")
+        history = state.get_message_history(2)
+        assert history == [
+            {"role": "user",      "content": "user msg 3"},
+            {"role": "assistant", "content": "assistant msg 3"},
+            {"role": "user",      "content": "user msg 4"},
+            {"role": "assistant", "content": "assistant msg 4"},
+        ]
+
+    def test_max_turns_zero_returns_empty_list(self):
+        state = _state()
+        state.add_turn("user msg", "assistant msg")
+        assert state.get_message_history(0) == []
@@ -0,0 +1,269 @@
+"""
+Tests for src/components/conversation_manager/llm_provider.py
+
+Covers the provider-independent pieces only — no network calls:
+- LLMProvider.chat_stream() default (whole reply as one delta)
+- CachedProvider: hits, temperature bypass, key sensitivity, streaming
+- create_provider() dispatch
+- shared HTTP session configuration
+- OllamaProvider request payload and body encoding (HTTP session stubbed)
+"""
+from __future__ import annotations
+
+import orjson
+import pytest
+from cachetools import LRUCache
+from urllib3.exceptions import MaxRetryError, ReadTimeoutError
+from urllib3.response import HTTPResponse
+
+from src.components.conversation_manager.llm_provider import (
+    _HTTP_SESSION,
+    DEFAULT_OLLAMA_MODEL,
+    CachedProvider,
+    OllamaProvider,
+    StubProvider,
+    create_provider,
+)
+
+_MSGS = [{"role": "user", "content": "Hello"}]
+
+
+def _cached(responses=None, max_temperature=0.3):
+    inner = StubProvider(responses=responses or ["first", "second", "third"])
+    return CachedProvider(inner, cache=LRUCache(maxsize=8),
+                          max_temperature=max_temperature), inner
+
+
+class TestChatStreamDefault:
+
+    def test_yields_whole_reply(self):
+        provider = StubProvider(responses=["Only reply."])
+        assert list(provider.chat_stream("sys", _MSGS)) == ["Only reply."]
+
+
+class TestCachedProvider:
+
+    def test_identical_prompt_served_from_cache(self):
+        provider, inner = _cached()
+        assert provider.chat("sys", _MSGS) == "first"
+        assert provider.chat("sys", _MSGS) == "first"
+        assert inner._index == 1
+
+    def test_different_messages_miss(self):
+        provider, _ = _cached()
+        provider.chat("sys", _MSGS)
+        other = [{"role": "user", "content": "Goodbye"}]
+        assert provider.chat("sys", other) == "second"
+
+    def test_different_system_message_misses(self):
+        provider, _ = _cached()
+        provider.chat("sys", _MSGS)
+        assert provider.chat("other sys", _MSGS) == "second"
+
+    def test_high_temperature_bypasses_cache(self):
+        provider, inner = _cached()
+        provider.chat("sys", _MSGS, temperature=0.7)
+        provider.chat("sys", _MSGS, temperature=0.7)
+        assert inner._index == 2
+
+    def test_stream_populates_cache(self):
+        provider, inner = _cached()
+        assert "".join(provider.chat_stream("sys", _MSGS)) == "first"
+        assert provider.chat("sys", _MSGS) == "first"
+        assert inner._index == 1
+
+    def test_stream_served_from_cache(self):
+        provider, inner = _cached()
+        provider.chat("sys", _MSGS)
+        assert list(provider.chat_stream("sys", _MSGS)) == ["first"]
+        assert inner._index == 1
+
+    def test_failed_stream_not_cached(self):
+        provider, inner = _cached()
+
+        def failing_stream(*args, **kwargs):
+            yield "Hel"
+            raise RuntimeError("model runner has unexpectedly stopped")
+
+        inner.chat_stream = failing_stream
+        with pytest.raises(RuntimeError):
+            list(provider.chat_stream("sys", _MSGS))
+        assert provider.chat("sys", _MSGS) == "first"
+
+    def test_closed_stream_not_cached(self):
+        provider, inner = _cached()
+        inner.chat_stream = lambda *args, **kwargs: iter(["Hel", "lo"])
+        stream = provider.chat_stream("sys", _MSGS)
+        assert next(stream) == "Hel"
+        stream.close()
+        assert provider.chat("sys", _MSGS) == "first"
+
+    def test_zero_size_cache_is_bypassed(self):
+        inner = StubProvider(responses=["first", "second"])
+        provider = CachedProvider(inner, cache=LRUCache(maxsize=0))
+        assert provider.chat("sys", _MSGS) == "first"
+        assert provider.chat("sys", _MSGS) == "second"
+
+    def test_model_name_passthrough(self):
+        provider, inner = _cached()
+        assert provider.model_name == inner.model_name
+
+
+class TestCreateProvider:
+
+    def test_stub_is_not_cached(self):
+        assert isinstance(create_provider("stub"), StubProvider)
+
+    def test_unknown_provider_raises(self):
+        with pytest.raises(ValueError):
+            create_provider("nope")
+
+
+class TestHTTPSession:
+
+    @pytest.mark.parametrize("url", ["http://localhost:11434", "https://example.org"])
+    def test_pooled_adapter_mounted(self, url):
+        adapter = _HTTP_SESSION.get_adapter(url)
+        assert adapter._pool_maxsize == 32
+
+    def test_gateway_errors_retried_for_post(self):
+        retry = _HTTP_SESSION.get_adapter("https://example.org").max_retries
+        assert retry.total == 3
+        assert {502, 503, 504} <= set(retry.status_forcelist)
+        assert retry.is_retry("POST", 503)
+        assert not retry.is_retry("POST", 500)
+
+    def test_post_read_timeout_not_retried(self):
+        retry = _HTTP_SESSION.get_adapter("https://example.org").max_retries
+        err = ReadTimeoutError(None, "/api/chat", "Read timed out.")
+        with pytest.raises(MaxRetryError):
+            retry.increment(method="POST", url="/api/chat", error=err)
+
+    def test_gateway_error_still_retried_after_read_limit(self):
+        retry = _HTTP_SESSION.get_adapter("https://example.org").max_retries
+        after = retry.increment(method="POST", url="/api/chat",
+                                response=HTTPResponse(status=503))
+        assert after.total == 2
+
+
+class TestOllamaPayload:
+
+    @pytest.fixture
+    def provider(self, monkeypatch):
+        monkeypatch.setenv("OLLAMA_API_KEY", "test-key")
+        monkeypatch.delenv("OLLAMA_KEEP_ALIVE", raising=False)
+        monkeypatch.delenv("OLLAMA_MODEL", raising=False)
+        return OllamaProvider()
+
+    def test_headers_shared_between_providers(self, provider):
+        other = OllamaProvider()
+        assert other.headers is provider.headers
+        assert provider.headers["Authorization"] == "Bearer test-key"
+
+    def test_missing_api_key_raises(self, monkeypatch):
+        monkeypatch.delenv("OLLAMA_API_KEY", raising=False)
+        with pytest.raises(EnvironmentError):
+            OllamaProvider()
+
+    def test_default_model_is_quantised(self, provider):
+        assert provider.model_name == DEFAULT_OLLAMA_MODEL == "llama3.1:8b-instruct-q4_K_M"
+        assert provider._payload("sys", _MSGS, 0.0, stream=False)["model"] == DEFAULT_OLLAMA_MODEL
+
+    def test_model_from_env(self, monkeypatch):
+        monkeypatch.setenv("OLLAMA_API_KEY", "test-key")
+        monkeypatch.setenv("OLLAMA_MODEL", "llama3.1:8b-instruct-q5_K_M")
+        assert OllamaProvider().model_name == "llama3.1:8b-instruct-q5_K_M"
+
+    def test_explicit_model_wins(self, monkeypatch):
+        monkeypatch.setenv("OLLAMA_API_KEY", "test-key")
+        monkeypatch.setenv("OLLAMA_MODEL", "llama3.1:8b-instruct-q5_K_M")
+        assert OllamaProvider(model="llama3.1:8b").model_name == "llama3.1:8b"
+
+    def test_system_message_sent_first(self, provider):
+        payload = provider._payload("You are helpful.", _MSGS, 0.0, stream=False)
+        assert payload["messages"][0] == {"role": "system", "content": "You are helpful."}
+        assert payload["messages"][1:] == _MSGS
+
+    def test_keep_alive_default(self, provider):
+        assert provider._payload("sys", _MSGS, 0.0, stream=False)["keep_alive"] == "30m"
+
+    def test_keep_alive_from_env(self, monkeypatch):
+        monkeypatch.setenv("OLLAMA_API_KEY", "test-key")
+        monkeypatch.setenv("OLLAMA_KEEP_ALIVE", "-1")
+        assert OllamaProvider()._payload("sys", _MSGS, 0.0, stream=True)["keep_alive"] == "-1"
+
+    def test_num_keep_covers_system_message(self, provider):
+        payload = provider._payload("x" * 400, _MSGS, 0.2, stream=True)
+        assert payload["options"]["num_keep"] >= 100
+        assert payload["options"]["temperature"] == 0.2
+        assert payload["stream"] is True
+
+
+class _FakeResponse:
+    def __init__(self, content=b"", lines=()):
+        self.content = content
+        self._lines = lines
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        return iter(self._lines)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class TestOllamaRequests:
+
+    @pytest.fixture
+    def provider(self, monkeypatch):
+        monkeypatch.setenv("OLLAMA_API_KEY", "test-key")
+        return OllamaProvider(model="test-model")
+
+    def _capture(self, monkeypatch, response):
+        calls = []
+
+        def fake_post(url, **kwargs):
+            calls.append(kwargs)
+            return response
+
+        monkeypatch.setattr(_HTTP_SESSION, "post", fake_post)
+        return calls
+
+    def test_chat_sends_preencoded_body(self, provider, monkeypatch):
+        calls = self._capture(monkeypatch, _FakeResponse(
+            content=b'{"message": {"role": "assistant", "content": "Hi there"}}'))
+        assert provider.chat("sys", _MSGS, 0.0) == "Hi there"
+        kwargs = calls[0]
+        assert "json" not in kwargs
+        assert orjson.loads(kwargs["data"]) == provider._payload("sys", _MSGS, 0.0, stream=False)
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+
+    def test_chat_stream_yields_content_until_done(self, provider, monkeypatch):
+        lines = [b'{"message": {"content": "Hel"}, "done": false}', b"",
+                 b'{"message": {"content": "lo"}, "done": false}',
+                 b'{"message": {"content": ""}, "done": true}',
+                 b'{"message": {"content": "ignored"}}']
+        calls = self._capture(monkeypatch, _FakeResponse(lines=lines))
+        assert list(provider.chat_stream("sys", _MSGS)) == ["Hel", "lo"]
+        assert orjson.loads(calls[0]["data"])["stream"] is True
+
+    def test_chat_stream_raises_on_error_line(self, provider, monkeypatch):
+        lines = [b'{"message": {"content": "Hel"}, "done": false}',
+                 b'{"error": "model runner has unexpectedly stopped"}']
+        self._capture(monkeypatch, _FakeResponse(lines=lines))
+        deltas = []
+        with pytest.raises(RuntimeError, match="unexpectedly stopped"):
+            for delta in provider.chat_stream("sys", _MSGS):
+                deltas.append(delta)
+        assert deltas == ["Hel"]
+
+    def test_chat_stream_raises_without_done_frame(self, provider, monkeypatch):
+        lines = [b'{"message": {"content": "Hel"}, "done": false}']
+        self._capture(monkeypatch, _FakeResponse(lines=lines))
+        with pytest.raises(RuntimeError, match="before the reply was done"):
+            list(provider.chat_stream("sys", _MSGS))
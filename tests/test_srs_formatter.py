@@ -385,4 +385,16 @@ class TestWrite:
     def test_creates_output_dir_if_missing(self, tmp_path):
         new_dir = tmp_path / "nested" / "output"
         path = _formatter().write(_populated_template(), _state(), new_dir)
-        assert path.exists()
\ No newline at end of file
+        assert path.exists()
+
+    def test_file_matches_markdown_as_utf8(self, tmp_path):
+        fmt = _formatter()
+        tmpl, state = _populated_template(), _state()
+        path = fmt.write(tmpl, state, tmp_path)
+        assert path.read_bytes() == fmt.to_markdown(tmpl, state).encode("utf-8")
+
+    def test_file_matches_markdown_without_smart_with_transcript(self, tmp_path):
+        fmt = _formatter(show_smart=False, show_transcript_summary=True)
+        tmpl, state = _populated_template(), _state()
+        path = fmt.write(tmpl, state, tmp_path)
+        assert path.read_bytes() == fmt.to_markdown(tmpl, state).encode("utf-8")
\ No newline at end of file
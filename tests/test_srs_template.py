@@ -156,6 +156,16 @@ class TestHeuristicSmartCheck:
             "The system shall achieve 99.9% uptime monthly.")
         assert SmartFlag.MEASURABLE in ann.satisfied
 
+    def test_measurable_with_unit(self):
+        ann = _heuristic_smart_check(
+            "The system shall store up to 50 GB of attachments per tenant.")
+        assert SmartFlag.MEASURABLE in ann.satisfied
+
+    def test_measurable_with_bound_phrase(self):
+        ann = _heuristic_smart_check(
+            "The system shall keep no more than 3 failed login attempts.")
+        assert SmartFlag.MEASURABLE in ann.satisfied
+
     def test_measurable_missing_without_number(self):
         ann = _heuristic_smart_check(
             "The system shall respond quickly to all requests.")
@@ -180,6 +190,17 @@ class TestHeuristicSmartCheck:
             "The system shall be fast and intuitive for all users.")
         assert SmartFlag.UNAMBIGUOUS in ann.violated
 
+    def test_vague_word_followed_by_punctuation(self):
+        ann = _heuristic_smart_check(
+            "The system shall be robust, fast.")
+        assert SmartFlag.UNAMBIGUOUS in ann.violated
+        assert "fast" in ann.notes and "robust" in ann.notes
+
+    def test_vague_word_inside_longer_word_ignored(self):
+        ann = _heuristic_smart_check(
+            "The system shall log breakfast orders within 2 seconds.")
+        assert SmartFlag.UNAMBIGUOUS in ann.satisfied
+
     def test_relevant_always_set_for_nonempty(self):
         ann = _heuristic_smart_check(
             "The system shall allow admin users to manage accounts.")
@@ -23,6 +23,7 @@ from __future__ import annotations
 
 import json
 import sys
+import threading
 import types
 from typing import Literal
 from unittest.mock import MagicMock
@@ -160,10 +161,13 @@ _ensure_stub(
 # ---------------------------------------------------------------------------
 from src.components.conversation_manager.llm_provider import StubProvider
 from src.components.conversation_manager.conversation_manager import (
-    ConversationManager, MAX_HISTORY_TURNS,
+    ConversationManager, MAX_HISTORY_TURNS, MAX_HISTORY_TOKENS,
 )
+from src.components.conversation_manager.utils import estimate_tokens, _trim_history
 from src.components.conversation_state import ConversationState, RequirementType
-from src.components.conversation_manager.session_logger import SessionLogger
+from src.components.conversation_manager.session_logger import (
+    SessionLogger, flush_log, flush_logs, read_log_entries,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -199,6 +203,40 @@ class TestConstants:
         assert MAX_HISTORY_TURNS == 10
 
 
+# ---------------------------------------------------------------------------
+# _trim_history
+# ---------------------------------------------------------------------------
+
+def _pair(i, size=40):
+    return [{"role": "user", "content": f"q{i} " + "x" * size},
+            {"role": "assistant", "content": f"a{i} " + "y" * size}]
+
+
+class TestTrimHistory:
+    def test_under_budget_unchanged(self):
+        msgs = _pair(0) + [{"role": "user", "content": "now"}]
+        assert _trim_history(msgs, 1000) == msgs
+
+    def test_drops_oldest_pairs_first(self):
+        msgs = _pair(0, 400) + _pair(1, 400) + [{"role": "user", "content": "now"}]
+        trimmed = _trim_history(msgs, 250)
+        assert trimmed == msgs[2:]
+
+    def test_latest_message_always_kept(self):
+        msgs = _pair(0, 400) + [{"role": "user", "content": "z" * 4000}]
+        assert _trim_history(msgs, 10) == msgs[-1:]
+
+    def test_starts_with_user_message(self):
+        msgs = ([{"role": "assistant", "content": "greeting " * 50}]
+                + _pair(0, 400) + [{"role": "user", "content": "now"}])
+        trimmed = _trim_history(msgs, 150)
+        assert trimmed[0]["role"] == "user"
+        assert trimmed[-1]["content"] == "now"
+
+    def test_empty_list(self):
+        assert _trim_history([], 100) == []
+
+
 # ---------------------------------------------------------------------------
 # ConversationManager initialisation
 # ---------------------------------------------------------------------------
@@ -241,6 +279,10 @@ class TestStartSession:
         session_id, _, _, _ = _make_manager(tmp_path).start_session()
         assert len(session_id) == 8
 
+    def test_session_id_is_hex(self, tmp_path):
+        session_id, _, _, _ = _make_manager(tmp_path).start_session()
+        int(session_id, 16)
+
     def test_session_id_is_string(self, tmp_path):
         session_id, _, _, _ = _make_manager(tmp_path).start_session()
         assert isinstance(session_id, str)
@@ -361,6 +403,25 @@ class TestSendTurn:
             mgr.send_turn(f"Turn {i}", state, logger)
         assert len(captured.get("messages", [])) <= MAX_HISTORY_TURNS * 2 + 1
 
+    def test_history_trimmed_to_token_budget(self, tmp_path):
+        long_reply = "word " * 800  # ~1000 estimated tokens
+        mgr = _make_manager(tmp_path, responses=[long_reply])
+        _, state, logger, _ = mgr.start_session()
+        captured = {}
+        real_chat = mgr.provider.chat
+
+        def spy(system_message, messages, temperature=0.0):
+            captured["messages"] = messages
+            return real_chat(system_message, messages, temperature)
+
+        mgr.provider.chat = spy
+        for i in range(10):
+            mgr.send_turn(f"Turn {i}", state, logger)
+        sent = captured["messages"]
+        assert sum(estimate_tokens(m["content"]) for m in sent) <= MAX_HISTORY_TOKENS
+        assert sent[0]["role"] == "user"
+        assert sent[-1] == {"role": "user", "content": "Turn 9"}
+
     def test_srs_template_updated(self, tmp_path):
         mgr, state, logger = self._setup(tmp_path)
         mgr._srs_template = MagicMock()
@@ -374,6 +435,164 @@ class TestSendTurn:
         mgr._gap_detector.analyse.assert_called_once_with(state)
 
 
+class TestSendTurnStream:
+    def _drain(self, stream):
+        deltas = []
+        while True:
+            try:
+                deltas.append(next(stream))
+            except StopIteration as stop:
+                return deltas, stop.value
+
+    def test_yields_reply_and_returns_result(self, tmp_path):
+        mgr = _make_manager(tmp_path, responses=["Who are the primary users?"])
+        _, state, logger, _ = mgr.start_session()
+        deltas, result = self._drain(mgr.send_turn_stream("Hello.", state, logger))
+        assert "".join(deltas) == "Who are the primary users?"
+        assert _response(result) == "Who are the primary users?"
+
+    def test_joined_deltas_recorded_in_state(self, tmp_path):
+        mgr = _make_manager(tmp_path)
+        _, state, logger, _ = mgr.start_session()
+        mgr.provider.chat_stream = lambda **kw: iter(["Who ", "are ", "the users?"])
+        self._drain(mgr.send_turn_stream("Hello.", state, logger))
+        assert state.turn_count == 1
+        assert state.turns[0].assistant_message == "Who are the users?"
+
+    def test_llm_error_raises_runtime_error(self, tmp_path):
+        mgr = _make_manager(tmp_path)
+        _, state, logger, _ = mgr.start_session()
+        mgr.provider = MagicMock()
+        mgr.provider.chat_stream.side_effect = Exception("Network timeout")
+        with pytest.raises(RuntimeError, match="LLM API error"):
+            self._drain(mgr.send_turn_stream("Hello", state, logger))
+
+    def test_closed_stream_still_completes_turn(self, tmp_path):
+        mgr = _make_manager(tmp_path)
+        _, state, logger, _ = mgr.start_session()
+        mgr.provider.chat_stream = lambda **kw: iter(["Who ", "are ", "the users?"])
+        stream = mgr.send_turn_stream("Hello.", state, logger)
+        assert next(stream) == "Who "
+        stream.close()
+        assert state.turn_count == 1
+        assert state.turns[0].assistant_message == "Who are the users?"
+        logged = json.loads(logger.get_log_path().read_text(encoding="utf-8"))
+        assert any(e["event_type"] == "turn" for e in logged)
+
+    def test_closed_stream_records_nothing_on_llm_error(self, tmp_path):
+        mgr = _make_manager(tmp_path)
+        _, state, logger, _ = mgr.start_session()
+
+        def failing_stream(**kw):
+            yield "Who "
+            raise ConnectionError("dropped")
+
+        mgr.provider.chat_stream = failing_stream
+        stream = mgr.send_turn_stream("Hello.", state, logger)
+        next(stream)
+        stream.close()
+        assert state.turn_count == 0
+        logged = json.loads(logger.get_log_path().read_text(encoding="utf-8"))
+        assert not any(e["event_type"] == "turn" for e in logged)
+
+
+# ---------------------------------------------------------------------------
+# SessionLogger — append-only JSON array on disk
+# ---------------------------------------------------------------------------
+
+class TestSessionLogger:
+    def test_file_is_valid_json_after_each_event(self, tmp_path):
+        logger = SessionLogger(log_dir=tmp_path, session_id="abc")
+        for i in range(3):
+            logger.log_event("evt", {"i": i})
+            data = json.loads(logger.get_log_path().read_text(encoding="utf-8"))
+            assert len(data) == i + 1
+
+    def test_entries_kept_in_order(self, tmp_path):
+        logger = SessionLogger(log_dir=tmp_path, session_id="abc")
+        logger.log_event("first", {})
+        logger.log_turn(1, "user", "assistant", [])
+        logger.log_event("last", {})
+        data = json.loads(logger.get_log_path().read_text(encoding="utf-8"))
+        assert [e["event_type"] for e in data] == ["first", "turn", "last"]
+
+    def test_non_ascii_preserved(self, tmp_path):
+        logger = SessionLogger(log_dir=tmp_path, session_id="abc")
+        logger.log_event("evt", {"text": "Temperatur 10°C – Zürich"})
+        logger.log_event("evt", {"text": "ok"})
+        data = json.loads(logger.get_log_path().read_text(encoding="utf-8"))
+        assert data[0]["data"]["text"] == "Temperatur 10°C – Zürich"
+
+    def test_entry_snapshotted_when_logged(self, tmp_path):
+        logger = SessionLogger(log_dir=tmp_path, session_id="abc")
+        data = {"status": "before"}
+        logger.log_event("evt", data)
+        data["status"] = "after"
+        logged = json.loads(logger.get_log_path().read_text(encoding="utf-8"))
+        assert logged[0]["data"]["status"] == "before"
+
+    def test_flush_logs_writes_all_sessions(self, tmp_path):
+        loggers = [SessionLogger(log_dir=tmp_path, session_id=f"s{i}") for i in range(3)]
+        for _ in range(5):
+            for logger in loggers:
+                logger.log_event("evt", {})
+        flush_logs()
+        for i in range(3):
+            path = tmp_path / f"session_s{i}.json"
+            assert len(json.loads(path.read_text(encoding="utf-8"))) == 5
+
+    def test_flush_log_skips_other_sessions_writes(self, tmp_path):
+        release, other_written = threading.Event(), threading.Event()
+        own = SessionLogger(log_dir=tmp_path, session_id="own")
+        other = SessionLogger(log_dir=tmp_path, session_id="other")
+        other_write = other._write
+
+        def slow_write(line):
+            release.wait(2)
+            other_write(line)
+            other_written.set()
+
+        other._write = slow_write
+        own.log_event("mine", {})
+        other.log_event("theirs", {})
+        try:
+            path = own.get_log_path()
+            assert not other_written.is_set()
+            assert len(json.loads(path.read_text(encoding="utf-8"))) == 1
+        finally:
+            release.set()
+        other.get_log_path()
+        assert other_written.is_set()
+
+    def test_read_log_entries_matches_json(self, tmp_path):
+        logger = SessionLogger(log_dir=tmp_path, session_id="abc")
+        logger.log_event("first", {"a": 1})
+        logger.log_event("second", {"b": [1, 2]})
+        path = logger.get_log_path()
+        assert read_log_entries(path) == json.loads(path.read_text(encoding="utf-8"))
+
+    def test_read_log_entries_recovers_torn_write(self, tmp_path):
+        logger = SessionLogger(log_dir=tmp_path, session_id="abc")
+        logger.log_event("first", {})
+        logger.log_event("second", {})
+        path = logger.get_log_path()
+        raw = path.read_bytes()
+        path.write_bytes(raw[:-3] + b',\n{"timestamp": 1.0, "event_')
+        assert [e["event_type"] for e in read_log_entries(path)] == ["first", "second"]
+
+    def test_read_log_entries_reads_indented_layout(self, tmp_path):
+        path = tmp_path / "session_old.json"
+        path.write_text(json.dumps([{"event_type": "turn", "data": {}}], indent=2),
+                        encoding="utf-8")
+        assert read_log_entries(path) == [{"event_type": "turn", "data": {}}]
+
+    @pytest.mark.parametrize("entries", [[], [{"event_type": "turn", "data": {}}]])
+    def test_read_log_entries_reads_compact_layout(self, tmp_path, entries):
+        path = tmp_path / "session_compact.json"
+        path.write_text(json.dumps(entries), encoding="utf-8")
+        assert read_log_entries(path) == entries
+
+
 # ---------------------------------------------------------------------------
 # inject_requirements — integration with real state
 # ---------------------------------------------------------------------------
@@ -17,6 +17,8 @@ Import chain:
 from __future__ import annotations
 
 import sys
+import threading
+import time
 import types
 from enum import Enum
 from typing import Literal
@@ -162,6 +164,7 @@ from src.components.srs_coverage import (
 )
 from src.components.conversation_state import ConversationState, RequirementType
 from src.components.srs_template import SRSTemplate, UserClass
+from src.components import srs_coverage
 
 
 # ---------------------------------------------------------------------------
@@ -308,6 +311,11 @@ class TestExclusionsText:
         reqs = {"f1": _req("f1", "Users can log in", RequirementType.FUNCTIONAL)}
         assert "log in" not in _exclusions_text(_state(reqs=reqs))
 
+    def test_match_is_case_insensitive(self):
+        reqs = {"c1": _req("c1", "Offline mode is OUT OF SCOPE for release 1.",
+                            RequirementType.CONSTRAINT)}
+        assert "Offline mode" in _exclusions_text(_state(reqs=reqs))
+
 
 # ---------------------------------------------------------------------------
 # _domain_summary
@@ -347,6 +355,10 @@ class TestImpliedDataReqs:
     def test_no_match_returns_none_identified(self):
         assert "none" in _implied_data_reqs(_state()).lower()
 
+    def test_keyword_matches_inside_longer_word(self):
+        reqs = {"r1": _req("r1", "Administrators shall view Logging output.")}
+        assert "r1" in _implied_data_reqs(_state(reqs=reqs))
+
     def test_caps_at_10(self):
         reqs = {f"r{i}": _req(f"r{i}", "The system shall store records.") for i in range(20)}
         assert _implied_data_reqs(_state(reqs=reqs)).count("- [") <= 10
@@ -588,6 +600,76 @@ class TestEnrichIdempotent:
         assert tmpl.section2.product_perspective == "Existing perspective."
 
 
+# ---------------------------------------------------------------------------
+# SRSCoverageEnricher.enrich — concurrent LLM fills
+# ---------------------------------------------------------------------------
+
+class _SlowEchoProvider:
+    """Echoes the prompt after a short delay and records peak concurrency."""
+    model_name = "slow-echo"
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def chat(self, system_message, messages, temperature=0.0):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return messages[-1]["content"]
+
+
+def _seeded_gate(labels):
+    gate = MagicMock(); gate.seeded = True; gate.total = len(labels)
+    gate.domains = {}
+    for key, label in labels.items():
+        d = MagicMock(); d.label = label; d.status = "confirmed"
+        gate.domains[key] = d
+    return gate
+
+
+class TestEnrichConcurrency:
+    def test_llm_fills_run_concurrently(self):
+        provider = _SlowEchoProvider()
+        enricher = SRSCoverageEnricher(provider=provider, max_workers=4)
+        enricher.enrich(_template(), _state())
+        assert provider.peak > 1
+
+    def test_single_worker_runs_sequentially(self):
+        provider = _SlowEchoProvider(delay=0.01)
+        enricher = SRSCoverageEnricher(provider=provider, max_workers=1)
+        filled = enricher.enrich(_template(), _state())
+        assert provider.peak == 1
+        assert filled.get("§1.2 Scope") == "llm_synthesis"
+
+    def test_each_section_gets_its_own_result(self, monkeypatch):
+        monkeypatch.setattr(srs_coverage, "INTERFACES_PROMPT", "{interface_type}")
+        tmpl = _template()
+        SRSCoverageEnricher(provider=_SlowEchoProvider(delay=0)).enrich(tmpl, _state())
+        interfaces = tmpl.section3.interfaces
+        assert "User Interfaces" in interfaces.user_interfaces[0]
+        assert "Software Interfaces" in interfaces.software_interfaces[0]
+        assert "Communication Interfaces" in interfaces.communication_interfaces[0]
+
+    def test_product_functions_keep_domain_order(self, monkeypatch):
+        monkeypatch.setattr(srs_coverage, "PRODUCT_FUNCTIONS_DOMAIN_PROMPT", "{domain_reqs}")
+        labels = {"auth": "Authentication", "pay": "Payments", "rep": "Reporting"}
+        reqs = {f"r{i}": _req(f"r{i}", f"{label} requirement", domain_key=key)
+                for i, (key, label) in enumerate(labels.items())}
+        state = _state(reqs=reqs, domain_gate=_seeded_gate(labels))
+        tmpl = _template()
+        SRSCoverageEnricher(provider=_SlowEchoProvider(delay=0.01)).enrich(tmpl, state)
+        functions = tmpl.section2.product_functions
+        assert len(functions) == 3
+        for text, label in zip(functions, labels.values()):
+            assert f"{label} requirement" in text
+
+
 # ---------------------------------------------------------------------------
 # create_enricher
 # ---------------------------------------------------------------------------
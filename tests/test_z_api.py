@@ -114,6 +114,16 @@ class TestHealth:
         data = resp.get_json()
         assert "version" in data
 
+    def test_health_not_cacheable(self, client):
+        resp = client.get("/api/health")
+        assert resp.mimetype == "application/json"
+        assert resp.headers["Cache-Control"] == "no-store"
+
+    def test_health_follows_provider_name(self, client, monkeypatch):
+        import app as _app_mod
+        monkeypatch.setattr(_app_mod, "_provider_name", "ollama")
+        assert client.get("/api/health").get_json()["provider"] == "ollama"
+
 
 # /api/projects
 
@@ -139,6 +149,15 @@ class TestProjects:
         assert "id" in data["project"]
         assert len(data["project"]["id"]) > 0
 
+    def test_create_project_id_is_12_hex_chars(self, client):
+        project_id = _create_project(client).get_json()["project"]["id"]
+        assert len(project_id) == 12
+        int(project_id, 16)
+
+    def test_response_keys_are_sorted(self, client):
+        project = json.loads(_create_project(client).get_data())["project"]
+        assert list(project) == sorted(project)
+
     def test_create_project_missing_name_returns_400(self, client):
         resp = _post(client, "/api/projects/create", {"task_type": "elicitation"})
         assert resp.status_code == 400
@@ -162,6 +181,13 @@ class TestProjects:
         data = resp.get_json()
         assert data["project"]["name"] == "Library System"
 
+    def test_project_non_ascii_name_round_trips(self, client):
+        create_resp = _create_project(client, "Système de bibliothèque — 図書館")
+        assert create_resp.mimetype == "application/json"
+        project_id = create_resp.get_json()["project"]["id"]
+        resp = client.get(f"/api/projects/{project_id}")
+        assert resp.get_json()["project"]["name"] == "Système de bibliothèque — 図書館"
+
     def test_get_project_not_found_returns_404(self, client):
         resp = client.get("/api/projects/nonexistent-id-12345")
         assert resp.status_code == 404
@@ -346,4 +372,142 @@ class TestSessionTurn:
         start_resp = _start_session(client)
         session_id = start_resp.get_json()["session_id"]
         resp = _post(client, "/api/session/turn", {"session_id": session_id})
-        assert resp.status_code in (400, 422)
\ No newline at end of file
+        assert resp.status_code in (400, 422)
+
+# /api/session/turn/stream
+
+def _sse_frames(resp):
+    """Parse an SSE body into a list of (event, data) tuples."""
+    frames = []
+    for block in resp.get_data(as_text=True).split("\n\n"):
+        if not block.strip():
+            continue
+        event = ""
+        data = None
+        for line in block.splitlines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+        frames.append((event, data))
+    return frames
+
+
+class TestSessionTurnStream:
+
+    def test_stream_returns_event_stream(self, client):
+        session_id = _start_session(client).get_json()["session_id"]
+        resp = _post(client, "/api/session/turn/stream",
+                     {"session_id": session_id, "message": "Hello."})
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/event-stream"
+
+    def test_stream_deltas_join_to_reply(self, client):
+        session_id = _start_session(client).get_json()["session_id"]
+        resp = _post(client, "/api/session/turn/stream",
+                     {"session_id": session_id, "message": "Hello."})
+        frames = _sse_frames(resp)
+        deltas = "".join(d["delta"] for e, d in frames if e == "")
+        done = [d for e, d in frames if e == "done"]
+        assert len(done) == 1
+        assert deltas == done[0]["assistant_reply"]
+
+    def test_stream_done_has_turn_payload(self, client):
+        session_id = _start_session(client).get_json()["session_id"]
+        resp = _post(client, "/api/session/turn/stream",
+                     {"session_id": session_id, "message": "Hello."})
+        done = next(d for e, d in _sse_frames(resp) if e == "done")
+        assert done["turn_id"] == 1
+        assert "gap_report" in done
+        assert "coverage_report" in done
+
+    def test_client_disconnect_still_records_turn(self, client):
+        import app as _app_mod
+        session_id = _start_session(client).get_json()["session_id"]
+        resp = client.post("/api/session/turn/stream",
+                           json={"session_id": session_id, "message": "Hello."},
+                           buffered=False)
+        next(iter(resp.response))  # first delta frame, then the client goes away
+        resp.close()
+        state = _app_mod._sessions[session_id]["state"]
+        assert state.turn_count == 1
+        assert state.turns[0].assistant_message
+
+    def test_stream_invalid_session_returns_404(self, client):
+        resp = _post(client, "/api/session/turn/stream",
+                     {"session_id": "bad-session-id", "message": "Hello."})
+        assert resp.status_code == 404
+
+    def test_sse_frame_encoded_like_json_responses(self, flask_app):
+        import app as _app_mod
+        frame = _app_mod._sse({"b": 1, 2: "two"}, "done")
+        assert frame == 'event: done\ndata: {"2":"two","b":1}\n\n'
+
+    def test_stream_missing_message_returns_400(self, client):
+        session_id = _start_session(client).get_json()["session_id"]
+        resp = _post(client, "/api/session/turn/stream", {"session_id": session_id})
+        assert resp.status_code == 400
+
+
+# Live-session LRU bound
+
+class TestSessionEviction:
+
+    @pytest.fixture
+    def small_cache(self, monkeypatch):
+        import app as _app_mod
+        cache = _app_mod._SessionCache(maxsize=2)
+        monkeypatch.setattr(_app_mod, "_sessions", cache)
+        return cache
+
+    def test_live_sessions_bounded(self, client, small_cache):
+        sids = [_start_session(client).get_json()["session_id"] for _ in range(3)]
+        assert len(small_cache) == 2
+        assert sids[0] not in small_cache
+        assert sids[2] in small_cache
+
+    def test_recently_used_session_kept(self, client, small_cache):
+        first = _start_session(client).get_json()["session_id"]
+        second = _start_session(client).get_json()["session_id"]
+        client.get(f"/api/session/status?session_id={first}")
+        _start_session(client)
+        assert first in small_cache
+        assert second not in small_cache
+
+    def test_log_listing_does_not_change_recency(self, client, monkeypatch):
+        import app as _app_mod
+        cache = _app_mod._SessionCache(maxsize=3)
+        monkeypatch.setattr(_app_mod, "_sessions", cache)
+        sids = []
+        for i in range(3):
+            sid = _start_session(client).get_json()["session_id"]
+            _post(client, "/api/session/turn", {"session_id": sid, "message": f"Turn {i}."})
+            sids.append(sid)
+            assert client.get(f"/api/logs?active_session_id={sid}").status_code == 200
+        client.get(f"/api/logs/{sids[1]}/replay")
+        _start_session(client)
+        assert sids[0] not in cache
+        assert sids[1] in cache and sids[2] in cache
+
+    def test_unknown_session_still_not_found(self, client, small_cache):
+        resp = _post(client, "/api/session/turn",
+                     {"session_id": "0123456789ab", "message": "Hello."})
+        assert resp.status_code == 404
+
+    def test_peek_missing_returns_default(self, small_cache):
+        assert small_cache.peek("nope") is None
+        assert small_cache.peek("nope", {}) == {}
+
+    def test_evicted_session_replays_from_disk(self, client, small_cache):
+        evicted = _start_session(client).get_json()["session_id"]
+        _post(client, "/api/session/turn",
+              {"session_id": evicted, "message": "I need a library system."})
+        _start_session(client)
+        _start_session(client)
+        resp = _post(client, "/api/session/turn",
+                     {"session_id": evicted, "message": "Hello again."})
+        assert resp.status_code == 410
+        assert resp.get_json()["expired"] is True
+        replay = client.get(f"/api/logs/{evicted}/replay").get_json()
+        assert replay["source"] == "disk"
+        assert replay["turns"][0]["user_message"] == "I need a library system."